@@ -5,21 +5,46 @@ Run with: python api.py
 """
 
 import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
 
+import orjson
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from playwright.async_api import async_playwright
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Dict, Optional
 import uvicorn
 
-from scrape_dashboard import run_scraper, TARGET_URL
+from scrape_dashboard import run_scraper, OUTPUT_DIR, TARGET_URL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Launch one headless browser for the lifetime of the server."""
+    app.state.playwright = await async_playwright().start()
+    app.state.browser = await app.state.playwright.chromium.launch(headless=True)
+    try:
+        yield
+    finally:
+        await app.state.browser.close()
+        await app.state.playwright.stop()
+
 
 app = FastAPI(
     title="Dashboard Scraper API",
     description="API to trigger the MeicePro dashboard scraper and retrieve extracted data.",
+    lifespan=lifespan,
 )
 
-# Only one scrape can run at a time (browser + shared output directory)
-_scrape_lock = asyncio.Lock()
+# Each scrape gets its own browser context, so only scrapes sharing an output
+# directory need to be serialized
+_output_locks: Dict[Path, asyncio.Lock] = {}
+
+
+def _output_lock(output_dir: Optional[str]) -> asyncio.Lock:
+    key = (Path(output_dir) if output_dir else OUTPUT_DIR).resolve()
+    return _output_locks.setdefault(key, asyncio.Lock())
 
 
 class ScrapeRequest(BaseModel):
@@ -37,44 +62,74 @@ class ScrapeRequest(BaseModel):
     )
 
 
-class ScrapeResponse(BaseModel):
-    status: str
-    summary: dict
-    sections: list
-    api_responses: list
-
-
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
 
-@app.post("/scrape", response_model=ScrapeResponse)
+async def _run_scrape(request: ScrapeRequest, events: asyncio.Queue):
+    """Run a scrape, putting NDJSON events on the queue and None when done."""
+    async def on_section(section):
+        await events.put({"type": "section", "section": section})
+
+    try:
+        result = await run_scraper(
+            url=request.url,
+            output_dir=request.output_dir,
+            headless=request.headless,
+            # A visible window needs its own browser
+            browser=app.state.browser if request.headless else None,
+            on_section=on_section,
+        )
+        await events.put({
+            "type": "summary",
+            "status": "success",
+            "summary": result["summary"],
+            "api_responses": result["api_responses"],
+        })
+    except Exception as e:
+        await events.put({"type": "error", "status": "error", "detail": str(e)})
+    finally:
+        await events.put(None)
+
+
+async def _stream_events(events: asyncio.Queue, task: asyncio.Task):
+    """Yield queued events as NDJSON lines until the scrape task finishes."""
+    try:
+        while (event := await events.get()) is not None:
+            yield orjson.dumps(event) + b"\n"
+    finally:
+        # Client went away mid-stream
+        if not task.done():
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+@app.post("/scrape")
 async def scrape(request: ScrapeRequest = ScrapeRequest()):
     """
     Trigger a scrape of the target dashboard.
 
-    Launches a headless browser, navigates the dashboard, extracts data from
-    all pages, captures API responses, and returns the collected data as JSON.
+    Opens a fresh context on the shared headless browser, navigates the
+    dashboard, extracts data from all pages, and captures API responses.
+    Results are streamed as newline-delimited JSON: one "section" line per
+    page as soon as it is extracted, then a final "summary" (or "error") line.
     """
-    if _scrape_lock.locked():
-        raise HTTPException(status_code=429, detail="A scrape is already in progress. Try again later.")
-
-    async with _scrape_lock:
-        try:
-            result = await run_scraper(
-                url=request.url,
-                output_dir=request.output_dir,
-                headless=request.headless,
-            )
-            return ScrapeResponse(
-                status="success",
-                summary=result["summary"],
-                sections=result["sections"],
-                api_responses=result["api_responses"],
-            )
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=str(e))
+    lock = _output_lock(request.output_dir)
+    if lock.locked():
+        raise HTTPException(
+            status_code=429,
+            detail="A scrape into this output directory is already in progress. Try again later."
+        )
+    # Nothing awaits between the check and the acquire, so it never blocks
+    await lock.acquire()
+
+    # The task owns the lock, so it is released even if the stream never starts
+    events: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_run_scrape(request, events))
+    task.add_done_callback(lambda _: lock.release())
+
+    return StreamingResponse(_stream_events(events, task), media_type="application/x-ndjson")
 
 
 if __name__ == "__main__":
@@ -5,17 +5,32 @@ Main page + Detail pages (Aging & Skin Analysis)
 """
 
 import asyncio
-import json
 import logging
+from contextlib import AsyncExitStack
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 
-from playwright.async_api import async_playwright
+import orjson
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError, async_playwright
 
 TARGET_URL = 'https://eu-meicepro-api.meiquc.cn/meicepro-h5/pages/report/report?id=5111c64f-88bd-49de-81d2-700916ef7750&language=it'
 OUTPUT_DIR = Path('./complete_data')
 LOG_DIR = Path('./logs')
 TIMEOUT = 60000
+DETAIL_TIMEOUT = 10000
+# How long a click may take to change the URL before it is treated as a modal
+NAVIGATION_TIMEOUT = 3000
+SCREENSHOT_QUALITY = 75
+WRITE_WORKERS = 4
+WRITE_QUEUE_SIZE = 8
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+OUTPUT_SUBDIRS = ('data', 'screenshots', 'api_data')
+# Resource types never requested; stylesheets still load so screenshots keep their layout
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'font', 'media'})
+
+# Characters replaced with '_' in section file names
+_SAFE_NAME_TABLE = str.maketrans(' /\\:', '____')
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +49,82 @@ def setup_logging():
     )
 
 
+async def _block_heavy_resources(route):
+    """Abort requests for resources the scraper never reads"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _write_bytes(path, data):
+    """Write bytes to path in a worker thread so the event loop keeps running"""
+    await asyncio.to_thread(Path(path).write_bytes, data)
+
+
+async def _write_json(path, obj):
+    """Write obj to path as indented UTF-8 JSON"""
+    await _write_bytes(path, orjson.dumps(obj, option=JSON_OPTIONS))
+
+
+class OutputWriter:
+    """
+    Owns the output subdirectories and pipelines file writes
+
+    Writes are pushed onto a bounded queue and flushed by background workers,
+    so scraping moves on to the next click while earlier files hit the disk.
+    Every queued file name is recorded for the summary.
+    """
+
+    def __init__(self, out_dir, workers=WRITE_WORKERS, queue_size=WRITE_QUEUE_SIZE):
+        self.dirs = {sub: out_dir / sub for sub in OUTPUT_SUBDIRS}
+        self.files = {sub: [] for sub in OUTPUT_SUBDIRS}
+        self._queue = asyncio.Queue(maxsize=queue_size)
+        self._worker_count = workers
+        self._workers = []
+
+    def start(self):
+        """Create the output directories and start the writer tasks"""
+        for directory in self.dirs.values():
+            directory.mkdir(parents=True, exist_ok=True)
+        self._workers = [asyncio.create_task(self._drain()) for _ in range(self._worker_count)]
+
+    async def _drain(self):
+        while True:
+            path, data = await self._queue.get()
+            try:
+                await _write_bytes(path, data)
+            except Exception as e:
+                logger.error(f"❌ Failed to write {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    async def write(self, sub, name, data):
+        """Queue bytes to be written to the given output subdirectory"""
+        await self._queue.put((self.dirs[sub] / name, data))
+        self.files[sub].append(name)
+
+    async def write_json(self, sub, name, obj):
+        """Queue obj to be written as indented UTF-8 JSON"""
+        await self.write(sub, name, orjson.dumps(obj, option=JSON_OPTIONS))
+
+    async def close(self):
+        """Wait for queued writes to finish and stop the writer tasks"""
+        if not self._workers:
+            return
+        await self._queue.join()
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+
+async def _flush_api(apis, output, prefix):
+    """Queue one JSON file per captured API response"""
+    for i, api in enumerate(apis):
+        await output.write_json('api_data', f"{prefix}_api_{i+1}.json", api)
+
+
 def parse_structured_data(text, section_name):
     """Parse raw text into structured data"""
     lines = [line.strip() for line in text.split('\n') if line.strip()]
@@ -182,19 +273,27 @@ def parse_structured_data(text, section_name):
     }
 
 
-async def extract_section(page, section_name, section_num, output_dir):
+PAGE_INFO_JS = '''
+() => ({
+    text: document.body ? document.body.innerText : '',
+    html_len: document.documentElement.outerHTML.length,
+    url: location.href
+})
+'''
+
+
+async def extract_section(page, section_name, section_num, output):
     """Extract data from current page"""
     logger.info(f"\n📊 Extracting: {section_name}")
 
-    await asyncio.sleep(3)
     try:
-        await page.wait_for_load_state('networkidle', timeout=10000)
+        await page.wait_for_selector('body :not(:empty)', state='attached', timeout=5000)
     except:
         pass
 
-    body = await page.query_selector('body')
-    text = await body.inner_text() if body else ""
-    html = await page.content()
+    # Fetch text, HTML size and URL in one round-trip; the HTML itself is never needed
+    info = await page.evaluate(PAGE_INFO_JS)
+    text = info['text']
 
     # Parse into structured format
     structured_data = parse_structured_data(text, section_name)
@@ -202,83 +301,112 @@ async def extract_section(page, section_name, section_num, output_dir):
     data = {
         'section_name': section_name,
         'section_number': section_num,
-        'url': page.url,
+        'url': info['url'],
         'timestamp': datetime.now().isoformat(),
         'data': structured_data,
         'raw_text_length': len(text),
-        'html_length': len(html)
+        'html_length': info['html_len']
     }
 
-    safe_name = section_name.replace(' ', '_')
-    json_file = output_dir / 'data' / f"{section_num}_{safe_name}.json"
-    with open(json_file, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-
-    screenshot_file = output_dir / 'screenshots' / f"{section_num}_{safe_name}.png"
-    await page.screenshot(path=str(screenshot_file), full_page=True)
+    safe_name = section_name.translate(_SAFE_NAME_TABLE)
+    json_name = f"{section_num}_{safe_name}.json"
+    screenshot_name = f"{section_num}_{safe_name}.jpg"
+    await output.write_json('data', json_name, data)
+    screenshot = await page.screenshot(type='jpeg', quality=SCREENSHOT_QUALITY, full_page=True)
+    await output.write('screenshots', screenshot_name, screenshot)
 
     logger.info(f"  ✓ Text: {len(text):,} chars")
-    logger.info(f"  ✓ URL: {page.url}")
-    logger.info(f"  ✓ Saved: {json_file.name}")
+    logger.info(f"  ✓ URL: {info['url']}")
+    logger.info(f"  ✓ Saved: {json_name}")
 
     return data
 
 
-async def find_and_click_all_buttons(page, output_dir, section_start_num, api_requests, target_url=None):
-    """Find ALL 'Visualizza di più' buttons and click them one by one"""
-    target_url = target_url or TARGET_URL
+# Tags every visible element labelled "Visualizza di più" with a data-scrape-id and
+# resolves its dashboard section in a single pass inside the browser. Installed
+# once per document as window.__scrapeSnapshotButtons so the source is parsed
+# once rather than on every snapshot.
+BUTTON_SNAPSHOT_INIT_JS = '''
+window.__scrapeSnapshotButtons = () => {
+    document.querySelectorAll('[data-scrape-id]').forEach(el => el.removeAttribute('data-scrape-id'));
+
+    const buttons = [];
+    const seenPositions = new Set();
+
+    // Visit only the text nodes carrying the label rather than testing every element's textContent
+    const walker = document.createTreeWalker(document.body, NodeFilter.SHOW_TEXT, {
+        acceptNode: node => node.nodeValue.includes('Visualizza di più')
+            ? NodeFilter.FILTER_ACCEPT
+            : NodeFilter.FILTER_SKIP
+    });
+
+    for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+        const el = node.parentElement;
+        if (!el) continue;
+
+        const box = el.getBoundingClientRect();
+        if (!box.width || !box.height || getComputedStyle(el).visibility === 'hidden') continue;
+
+        // Use position to deduplicate (group nearby elements)
+        const posKey = `${Math.trunc(box.x / 10)}_${Math.trunc(box.y / 10)}`;
+        if (seenPositions.has(posKey)) continue;
+        seenPositions.add(posKey);
+
+        let section = 'Unknown';
+        for (let parent = el.parentElement; parent; parent = parent.parentElement) {
+            const text = parent.textContent;
+            if (text.includes('Livello di Invecchiamento')) { section = 'Aging_Level'; break; }
+            if (text.includes('Analisi della Pelle')) { section = 'Skin_Analysis'; break; }
+        }
+        if (section === 'Unknown') continue;
 
-    # Find ALL elements with this text
-    all_elements = await page.query_selector_all('*:has-text("Visualizza di più")')
+        el.setAttribute('data-scrape-id', buttons.length);
+        buttons.push({id: buttons.length, section, position: [Math.trunc(box.x), Math.trunc(box.y)]});
+    }
+    return buttons;
+};
+'''
+BUTTON_SNAPSHOT_JS = 'window.__scrapeSnapshotButtons()'
 
-    clickable_buttons = []
-    seen_positions = set()
 
-    for elem in all_elements:
-        try:
-            is_visible = await elem.is_visible()
-            if not is_visible:
-                continue
-
-            box = await elem.bounding_box()
-            if not box:
-                continue
-
-            # Use position to deduplicate
-            pos = (int(box['x']), int(box['y']))
-            pos_key = f"{pos[0]//10}_{pos[1]//10}"  # Group nearby elements
-
-            if pos_key in seen_positions:
-                continue
-            seen_positions.add(pos_key)
-
-            # Get section name
-            section_name = await elem.evaluate('''
-                el => {
-                    let parent = el.parentElement;
-                    while (parent) {
-                        const text = parent.textContent;
-                        if (text.includes('Livello di Invecchiamento')) {
-                            return 'Aging_Level';
-                        }
-                        if (text.includes('Analisi della Pelle')) {
-                            return 'Skin_Analysis';
-                        }
-                        parent = parent.parentElement;
-                    }
-                    return 'Unknown';
-                }
-            ''')
+async def _return_to_main_page(page, target_url):
+    """Go back to the report page, reloading it only when history navigation fails"""
+    try:
+        # The report re-renders from history; its buttons appearing is the ready signal
+        await page.go_back(wait_until='commit', timeout=DETAIL_TIMEOUT)
+        await page.wait_for_selector('text=Visualizza di più', timeout=DETAIL_TIMEOUT)
+    except PlaywrightTimeoutError:
+        logger.info("  ! Back navigation stalled, reloading main page")
+        await page.goto(target_url, wait_until='domcontentloaded', timeout=TIMEOUT)
+        await page.wait_for_selector('text=Visualizza di più', timeout=TIMEOUT)
+
+
+async def _wait_for_detail_page(page, button_selector):
+    """Wait until the SPA has swapped the report for a rendered detail view"""
+    try:
+        # The old report DOM stays in place until the detail view replaces it
+        await page.wait_for_selector(button_selector, state='detached', timeout=DETAIL_TIMEOUT)
+        await page.wait_for_selector('text=Causa della Formazione', timeout=DETAIL_TIMEOUT)
+    except PlaywrightTimeoutError:
+        logger.info("  ! Detail page markers not found, extracting current view")
+
+
+async def find_and_click_all_buttons(page, output, section_start_num, capture,
+                                     record_section, target_url=None):
+    """
+    Find ALL 'Visualizza di più' buttons and click them one by one
+
+    capture['reqs'] is the list the response handler appends to; it is swapped
+    for a fresh list around each section rather than cleared in place.
+    record_section is awaited with each extracted detail section.
+    """
+    target_url = target_url or TARGET_URL
 
-            if section_name != 'Unknown':
-                clickable_buttons.append({
-                    'element': elem,
-                    'section': section_name,
-                    'position': pos
-                })
+    # Install the snapshot function for the current document and any reloads
+    await page.add_init_script(BUTTON_SNAPSHOT_INIT_JS)
+    await page.evaluate(f"() => {{ {BUTTON_SNAPSHOT_INIT_JS} }}")
 
-        except:
-            pass
+    clickable_buttons = await page.evaluate(BUTTON_SNAPSHOT_JS)
 
     logger.info(f"\n✅ Found {len(clickable_buttons)} clickable 'Visualizza di più' elements")
 
@@ -286,77 +414,47 @@ async def find_and_click_all_buttons(page, output_dir, section_start_num, api_re
     section_num = section_start_num
     for i, btn in enumerate(clickable_buttons):
         try:
+            # Re-tag buttons only if the main page DOM was rebuilt since the snapshot
+            if i and not await page.query_selector('[data-scrape-id="0"]'):
+                refound = await page.evaluate(BUTTON_SNAPSHOT_JS)
+                logger.info(f"  ✓ Re-found {len(refound)} buttons")
+
             logger.info(f"\n{'='*70}")
             logger.info(f"🖱️  Clicking [{i+1}/{len(clickable_buttons)}]: {btn['section']}")
             logger.info(f"{'='*70}")
 
             initial_url = page.url
-            api_requests.clear()
+            capture['reqs'] = []
 
-            # Multiple click attempts
-            await btn['element'].click(force=True)
-            await asyncio.sleep(6)  # Wait longer
+            # Click, then wait for the URL change and the detail view to render
+            button_selector = f'[data-scrape-id="{btn["id"]}"]'
+            await page.click(button_selector, force=True)
+            try:
+                await page.wait_for_url(lambda url: url != initial_url, timeout=NAVIGATION_TIMEOUT)
+            except PlaywrightTimeoutError:
+                pass
 
             # Check for navigation
             new_url = page.url
             if new_url != initial_url:
                 logger.info(f"  ✓ NAVIGATED to: {new_url}")
+                await _wait_for_detail_page(page, button_selector)
 
                 # Extract detail page
-                await extract_section(page, btn['section'], section_num, output_dir)
+                section_data = await extract_section(page, btn['section'], section_num, output)
+                await record_section(section_data)
 
-                # Save API data
-                for j, api in enumerate(api_requests):
-                    api_file = output_dir / 'api_data' / f"{section_num}_{btn['section']}_api_{j+1}.json"
-                    with open(api_file, 'w', encoding='utf-8') as f:
-                        json.dump(api, f, indent=2, ensure_ascii=False)
+                # Save API data; the writer flushes it while navigation continues
+                section_apis, capture['reqs'] = capture['reqs'], []
+                await _flush_api(section_apis, output, f"{section_num}_{btn['section']}")
 
-                if api_requests:
-                    logger.info(f"  ✓ Captured {len(api_requests)} API requests")
+                if section_apis:
+                    logger.info(f"  ✓ Captured {len(section_apis)} API requests")
 
                 section_num += 1
 
                 # Go back
-                await page.go_back(wait_until='networkidle', timeout=10000)
-                await asyncio.sleep(3)
-
-                # Re-find buttons after navigation
-                all_elements = await page.query_selector_all('*:has-text("Visualizza di più")')
-                clickable_buttons_new = []
-                seen_positions_new = set()
-
-                for elem in all_elements:
-                    try:
-                        if await elem.is_visible():
-                            box = await elem.bounding_box()
-                            if box:
-                                pos = (int(box['x']), int(box['y']))
-                                pos_key = f"{pos[0]//10}_{pos[1]//10}"
-                                if pos_key not in seen_positions_new:
-                                    seen_positions_new.add(pos_key)
-                                    section_name = await elem.evaluate('''
-                                        el => {
-                                            let parent = el.parentElement;
-                                            while (parent) {
-                                                const text = parent.textContent;
-                                                if (text.includes('Livello di Invecchiamento')) return 'Aging_Level';
-                                                if (text.includes('Analisi della Pelle')) return 'Skin_Analysis';
-                                                parent = parent.parentElement;
-                                            }
-                                            return 'Unknown';
-                                        }
-                                    ''')
-                                    if section_name != 'Unknown':
-                                        clickable_buttons_new.append({
-                                            'element': elem,
-                                            'section': section_name,
-                                            'position': pos
-                                        })
-                    except:
-                        pass
-
-                clickable_buttons = clickable_buttons_new
-                logger.info(f"  ✓ Re-found {len(clickable_buttons)} buttons")
+                await _return_to_main_page(page, target_url)
 
             else:
                 logger.info(f"  ! No navigation (modal?), same URL")
@@ -364,15 +462,15 @@ async def find_and_click_all_buttons(page, output_dir, section_start_num, api_re
         except Exception as e:
             logger.error(f"❌ Error: {e}")
             try:
-                await page.goto(target_url, wait_until='networkidle', timeout=TIMEOUT)
-                await asyncio.sleep(2)
+                await page.goto(target_url, wait_until='domcontentloaded', timeout=TIMEOUT)
+                await page.wait_for_selector('text=Visualizza di più', timeout=TIMEOUT)
             except:
                 pass
 
     return section_num
 
 
-async def run_scraper(url=None, output_dir=None, headless=True):
+async def run_scraper(url=None, output_dir=None, headless=True, browser=None, on_section=None):
     """
     Run the scraper and return the collected data.
 
@@ -380,6 +478,10 @@ async def run_scraper(url=None, output_dir=None, headless=True):
         url: Target URL to scrape (defaults to TARGET_URL)
         output_dir: Output directory path (defaults to OUTPUT_DIR)
         headless: Run browser in headless mode (defaults to True)
+        browser: Already-launched Playwright browser to reuse; the run gets its
+            own context on it and headless is ignored (defaults to launching one)
+        on_section: Optional coroutine function awaited with each section's
+            data as soon as it is extracted
 
     Returns:
         dict with summary, section data, and api data
@@ -396,33 +498,52 @@ async def run_scraper(url=None, output_dir=None, headless=True):
     logger.info("COMPLETE DASHBOARD SCRAPER")
     logger.info("=" * 80)
 
-    out_dir.mkdir(exist_ok=True)
-    (out_dir / 'data').mkdir(exist_ok=True)
-    (out_dir / 'screenshots').mkdir(exist_ok=True)
-    (out_dir / 'api_data').mkdir(exist_ok=True)
+    output = OutputWriter(out_dir)
+    output.start()
 
-    api_requests = []
+    capture = {'reqs': []}
     section_results = []
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        page = await browser.new_page()
-        await page.set_viewport_size({'width': 1920, 'height': 1080})
+    async def record_section(section_data):
+        section_results.append(section_data)
+        if on_section:
+            await on_section(section_data)
+
+    async with AsyncExitStack() as stack:
+        stack.push_async_callback(output.close)
+
+        if browser is None:
+            p = await stack.enter_async_context(async_playwright())
+            browser = await p.chromium.launch(headless=headless)
+            stack.push_async_callback(browser.close)
+
+        context = await browser.new_context(viewport={'width': 1920, 'height': 1080})
+        stack.push_async_callback(context.close)
+        await context.route('**/*', _block_heavy_resources)
+        page = await context.new_page()
+
+        api_host = urlsplit(target_url).netloc
 
         async def capture_api(response):
+            # Bind the current section's list before any await so a swap cannot redirect it
+            reqs = capture['reqs']
+            # Ignore third-party traffic before reading any body
+            if urlsplit(response.url).netloc != api_host:
+                return
             try:
                 if 'json' in response.headers.get('content-type', '').lower():
-                    try:
-                        body = await response.json()
-                    except:
-                        body = await response.text()
-                    api_requests.append({
+                    entry = {
                         'url': response.url,
                         'method': response.request.method,
-                        'status': response.status,
-                        'response': body,
-                        'timestamp': datetime.now().isoformat()
-                    })
+                        'status': response.status
+                    }
+                    # Unparseable bodies are recorded without their payload
+                    try:
+                        entry['response'] = orjson.loads(await response.body())
+                    except:
+                        pass
+                    entry['timestamp'] = datetime.now().isoformat()
+                    reqs.append(entry)
             except:
                 pass
 
@@ -430,60 +551,42 @@ async def run_scraper(url=None, output_dir=None, headless=True):
 
         # Load main page
         logger.info(f"\nLoading: {target_url}")
-        await page.goto(target_url, wait_until='networkidle', timeout=timeout)
-        await asyncio.sleep(3)
+        await page.goto(target_url, wait_until='domcontentloaded', timeout=timeout)
+        await page.wait_for_selector('text=Visualizza di più', timeout=timeout)
 
         # Extract main page
-        main_data = await extract_section(page, "Main_Page", 0, out_dir)
-        section_results.append(main_data)
+        main_data = await extract_section(page, "Main_Page", 0, output)
+        await record_section(main_data)
 
         # Save API data
-        main_page_apis = list(api_requests)
-        for i, api in enumerate(api_requests):
-            api_file = out_dir / 'api_data' / f"0_main_page_api_{i+1}.json"
-            with open(api_file, 'w', encoding='utf-8') as f:
-                json.dump(api, f, indent=2, ensure_ascii=False)
+        main_page_apis, capture['reqs'] = capture['reqs'], []
+        await _flush_api(main_page_apis, output, "0_main_page")
 
-        logger.info(f"  Captured {len(api_requests)} API requests from main page")
+        logger.info(f"  Captured {len(main_page_apis)} API requests from main page")
 
         # Find and click all buttons
-        final_section_num = await find_and_click_all_buttons(page, out_dir, 1, api_requests, target_url=target_url)
-
-        # Load detail section data from saved files
-        for i in range(1, final_section_num):
-            data_files = list((out_dir / 'data').glob(f'{i}_*.json'))
-            for df in data_files:
-                with open(df, 'r', encoding='utf-8') as f:
-                    section_results.append(json.load(f))
+        final_section_num = await find_and_click_all_buttons(
+            page, output, 1, capture, record_section, target_url=target_url
+        )
+        await output.close()
 
         # Summary
-        json_files = list((out_dir / 'data').glob('*.json'))
-        screenshots = list((out_dir / 'screenshots').glob('*.png'))
-        api_files_list = list((out_dir / 'api_data').glob('*.json'))
-
         summary = {
             'scrape_timestamp': datetime.now().isoformat(),
             'target_url': target_url,
             'total_sections': final_section_num,
-            'files': {
-                'data': sorted([f.name for f in json_files]),
-                'screenshots': sorted([f.name for f in screenshots]),
-                'api_data': sorted([f.name for f in api_files_list])
-            }
+            'files': {sub: sorted(names) for sub, names in output.files.items()}
         }
 
-        with open(out_dir / 'summary.json', 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        await _write_json(out_dir / 'summary.json', summary)
 
         logger.info("\n" + "=" * 80)
         logger.info("SCRAPING COMPLETE!")
         logger.info("=" * 80)
         logger.info(f"Output: {out_dir}")
-        logger.info(f"Data files: {len(json_files)}")
-        logger.info(f"Screenshots: {len(screenshots)}")
-        logger.info(f"API files: {len(api_files_list)}")
-
-        await browser.close()
+        logger.info(f"Data files: {len(output.files['data'])}")
+        logger.info(f"Screenshots: {len(output.files['screenshots'])}")
+        logger.info(f"API files: {len(output.files['api_data'])}")
 
     return {
         'summary': summary,
@@ -13,13 +13,22 @@ DEFAULT_EXPORT_CSV = False
 VIEWPORT_WIDTH = 1920
 VIEWPORT_HEIGHT = 1080
 
+# Concurrency settings
+MAX_CONCURRENT_PAGES = 4  # pages used to scrape tabs in parallel
+
 # Retry settings
 MAX_RETRY_ATTEMPTS = 3
-RETRY_DELAY = 2.0  # seconds
+RETRY_DELAY = 2.0  # seconds, doubled after each failed attempt
+MAX_RETRY_DELAY = 30.0  # seconds, cap for the backoff delay
 
 # Wait settings
-STABILIZATION_WAIT = 1.0  # seconds after network idle
+READY_SELECTOR = 'body'  # element that marks the dashboard as rendered after load
 ELEMENT_WAIT_TIMEOUT = 2000  # milliseconds
+DOM_QUIET_PERIOD = 500  # milliseconds without DOM mutations after network idle
+STABILIZATION_TIMEOUT = 1000  # milliseconds to wait for the DOM to go quiet
+
+# API capture limits
+MAX_CAPTURE_BODY_BYTES = 5 * 1024 * 1024  # larger response bodies are not stored
 
 # Pagination limits
 MAX_PAGINATION_PAGES = 50  # Safety limit to prevent infinite loops
@@ -27,6 +36,10 @@ MAX_PAGINATION_PAGES = 50  # Safety limit to prevent infinite loops
 # File naming
 MAX_FILENAME_LENGTH = 50
 
+# File writing
+WRITE_BUFFER_SIZE = 1 << 20  # bytes buffered per CSV file before flushing
+CSV_WRITE_WORKERS = 4  # threads writing CSV exports in parallel
+
 # Tab detection selectors
 TAB_SELECTORS = [
     '[role="tab"]',
@@ -4,12 +4,133 @@ Use this when standard tab detection doesn't work
 """
 
 import logging
-from typing import Any, Dict, List
-
-from playwright.async_api import Page
+import re
+from typing import TYPE_CHECKING, Any, Dict, List
 
 from . import config
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# Navigation keywords (Italian + English)
+NAV_KEYWORDS = [
+    'visualizza',  # view
+    'mostra',      # show
+    'dettagli',    # details
+    'analisi',     # analysis
+    'report',      # report
+    'più',         # more
+    'view',
+    'show',
+    'details',
+    'more',
+    'analysis'
+]
+
+# Single alternation matched once per candidate instead of one substring test per keyword
+NAV_KEYWORD_PATTERN = '|'.join(re.escape(keyword) for keyword in NAV_KEYWORDS)
+
+# Standard selectors with broader patterns, used by detect_all_clickable_navigation
+_BROAD_SELECTORS = [
+    # Standard tabs
+    '[role="tab"]',
+    '.tab',
+    '.nav-item',
+
+    # Vue.js / React common patterns
+    '[class*="tab-"]',
+    '[class*="nav-"]',
+    '[class*="menu-"]',
+
+    # Chinese/International frameworks
+    '.el-tabs__item',      # Element UI
+    '.ant-tabs-tab',       # Ant Design
+    '.van-tab',            # Vant UI
+    '.weui-navbar__item',  # WeUI
+
+    # Generic clickable navigation
+    'nav button',
+    'nav a',
+    '[class*="navigation"] button',
+    '[class*="navigation"] a'
+]
+
+_BROAD_SELECTOR_GROUPS = [
+    {'type': 'broad_selector', 'selector': selector, 'match_keywords': False, 'max_text_length': 99}
+    for selector in _BROAD_SELECTORS
+]
+
+# Candidate groups scanned by detect_custom_buttons, in priority order
+_CUSTOM_BUTTON_GROUPS = [
+    # 1. Visible buttons with navigation text
+    {'type': 'custom_button',
+     'selector': 'button, [role="button"], .btn, [class*="button"]',
+     'match_keywords': True,
+     'max_text_length': 100},
+    # 2. Clickable divs/spans with navigation text
+    {'type': 'clickable_element',
+     'selector': '[onclick], div[class*="click"], span[class*="click"]',
+     'match_keywords': True,
+     'max_text_length': 100},
+    # 3. Same-page links (not external)
+    {'type': 'navigation_link',
+     'selector': 'a',
+     'match_keywords': False,
+     'max_text_length': 100}
+]
+
+# Scans the candidate groups in order, keeping the first visible match per text
+_NAVIGATION_SCAN_JS = """
+({groups, keywordPattern}) => {
+    document.querySelectorAll('[data-nav-id]').forEach(el => el.removeAttribute('data-nav-id'));
+
+    const isVisible = el => {
+        const box = el.getBoundingClientRect();
+        return box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+
+    const keywordRe = new RegExp(keywordPattern, 'i');
+    const matches = [];
+    const seenTexts = new Set();
+    let nextId = 0;
+
+    for (const group of groups) {
+        let elements;
+        try {
+            elements = document.querySelectorAll(group.selector);
+        } catch (e) {
+            continue;  // Unsupported selector
+        }
+
+        elements.forEach((el, index) => {
+            if (!isVisible(el)) return;
+
+            const href = el.getAttribute('href');
+            if (group.type === 'navigation_link' && (!href || href.startsWith('http'))) return;
+
+            const text = (el.innerText || '').trim();
+            if (!text || text.length > group.max_text_length || seenTexts.has(text)) return;
+
+            if (group.match_keywords && !keywordRe.test(text)) return;
+
+            seenTexts.add(text);
+            if (!el.hasAttribute('data-nav-id')) el.setAttribute('data-nav-id', nextId++);
+            matches.push({
+                type: group.type,
+                selector: group.selector,
+                index,
+                text,
+                id: el.getAttribute('data-nav-id'),
+                tag: el.tagName,
+                classes: el.getAttribute('class') || '',
+                href
+            });
+        });
+    }
+    return matches;
+}
+"""
+
 
 class EnhancedNavigationDetector:
     """
@@ -17,10 +138,48 @@ class EnhancedNavigationDetector:
     Detects buttons, links, and clickable elements that lead to different views
     """
 
-    def __init__(self, page: Page, logger: logging.Logger):
+    def __init__(self, page: 'Page', logger: logging.Logger):
         self.page = page
         self.logger = logger
 
+    async def _scan(self, groups: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Scan candidate groups in a single page.evaluate
+
+        Matches are deduplicated by text in the browser, tagged with a
+        data-nav-id attribute and exposed as locators for clicking.
+        """
+        matches = await self.page.evaluate(
+            _NAVIGATION_SCAN_JS,
+            {'groups': groups, 'keywordPattern': NAV_KEYWORD_PATTERN}
+        )
+
+        navigation = []
+        for match in matches:
+            nav = {
+                'type': match['type'],
+                'index': match['index'],
+                'text': match['text'],
+                'element': self.page.locator(f'[data-nav-id="{match["id"]}"]')
+            }
+
+            if match['type'] == 'broad_selector':
+                nav['selector'] = match['selector']
+            elif match['type'] == 'custom_button':
+                nav['classes'] = match['classes']
+                self.logger.debug(f"Found custom button: '{match['text']}'")
+            elif match['type'] == 'clickable_element':
+                nav['tag'] = match['tag']
+                nav['classes'] = match['classes']
+                self.logger.debug(f"Found clickable element: '{match['text']}'")
+            else:
+                nav['href'] = match['href']
+                self.logger.debug(f"Found navigation link: '{match['text']}' -> {match['href']}")
+
+            navigation.append(nav)
+
+        return navigation
+
     async def detect_custom_buttons(self) -> List[Dict[str, Any]]:
         """
         Detect custom navigation buttons that don't follow standard patterns
@@ -29,199 +188,17 @@ class EnhancedNavigationDetector:
         - Clickable elements with specific classes
         - Links that stay on same domain
         """
-        custom_buttons = []
-
-        # Navigation keywords (Italian + English)
-        nav_keywords = [
-            'visualizza',  # view
-            'mostra',      # show
-            'dettagli',    # details
-            'analisi',     # analysis
-            'report',      # report
-            'più',         # more
-            'view',
-            'show',
-            'details',
-            'more',
-            'analysis'
-        ]
-
-        # 1. Find all visible buttons
         self.logger.debug("Searching for custom navigation buttons...")
-
-        all_buttons = await self.page.query_selector_all(
-            'button, [role="button"], .btn, [class*="button"]'
-        )
-
-        for i, btn in enumerate(all_buttons):
-            try:
-                is_visible = await btn.is_visible()
-                if not is_visible:
-                    continue
-
-                text = (await btn.inner_text()).strip()
-                if not text or len(text) > 100:
-                    continue
-
-                classes = await btn.get_attribute('class') or ''
-
-                # Check if text contains navigation keywords
-                text_lower = text.lower()
-                is_nav_button = any(keyword in text_lower for keyword in nav_keywords)
-
-                if is_nav_button:
-                    custom_buttons.append({
-                        'type': 'custom_button',
-                        'index': i,
-                        'text': text,
-                        'element': btn,
-                        'classes': classes
-                    })
-                    self.logger.debug(f"Found custom button: '{text}'")
-
-            except Exception as e:
-                self.logger.debug(f"Error checking button {i}: {e}")
-
-        # 2. Find clickable divs/spans with navigation text
-        clickable_elements = await self.page.query_selector_all(
-            '[onclick], div[class*="click"], span[class*="click"]'
-        )
-
-        for i, elem in enumerate(clickable_elements):
-            try:
-                is_visible = await elem.is_visible()
-                if not is_visible:
-                    continue
-
-                text = (await elem.inner_text()).strip()
-                if not text or len(text) > 100:
-                    continue
-
-                text_lower = text.lower()
-                is_nav_element = any(keyword in text_lower for keyword in nav_keywords)
-
-                if is_nav_element:
-                    tag = await elem.evaluate('el => el.tagName')
-                    classes = await elem.get_attribute('class') or ''
-
-                    custom_buttons.append({
-                        'type': 'clickable_element',
-                        'index': i,
-                        'text': text,
-                        'element': elem,
-                        'tag': tag,
-                        'classes': classes
-                    })
-                    self.logger.debug(f"Found clickable element: '{text}'")
-
-            except Exception as e:
-                self.logger.debug(f"Error checking clickable element {i}: {e}")
-
-        # 3. Find same-page links (not external)
-        links = await self.page.query_selector_all('a')
-
-        for i, link in enumerate(links):
-            try:
-                is_visible = await link.is_visible()
-                if not is_visible:
-                    continue
-
-                href = await link.get_attribute('href')
-                if not href or href.startswith('http'):
-                    # Skip external links
-                    continue
-
-                text = (await link.inner_text()).strip()
-                if not text or len(text) > 100:
-                    continue
-
-                custom_buttons.append({
-                    'type': 'navigation_link',
-                    'index': i,
-                    'text': text,
-                    'element': link,
-                    'href': href
-                })
-                self.logger.debug(f"Found navigation link: '{text}' -> {href}")
-
-            except Exception as e:
-                self.logger.debug(f"Error checking link {i}: {e}")
-
-        # Deduplicate by text
-        seen_texts = set()
-        unique_buttons = []
-        for btn in custom_buttons:
-            if btn['text'] not in seen_texts:
-                seen_texts.add(btn['text'])
-                unique_buttons.append(btn)
-
-        return unique_buttons
+        return await self._scan(_CUSTOM_BUTTON_GROUPS)
 
     async def detect_all_clickable_navigation(self) -> List[Dict[str, Any]]:
         """
         Comprehensive detection of all possible navigation elements
         Combines multiple strategies
         """
-        all_navigation = []
-
         # Strategy 1: Standard selectors with broader patterns
-        broad_selectors = [
-            # Standard tabs
-            '[role="tab"]',
-            '.tab',
-            '.nav-item',
-
-            # Vue.js / React common patterns
-            '[class*="tab-"]',
-            '[class*="nav-"]',
-            '[class*="menu-"]',
-
-            # Chinese/International frameworks
-            '.el-tabs__item',      # Element UI
-            '.ant-tabs-tab',       # Ant Design
-            '.van-tab',            # Vant UI
-            '.weui-navbar__item',  # WeUI
-
-            # Generic clickable navigation
-            'nav button',
-            'nav a',
-            '[class*="navigation"] button',
-            '[class*="navigation"] a'
-        ]
-
-        for selector in broad_selectors:
-            try:
-                elements = await self.page.query_selector_all(selector)
-                for i, elem in enumerate(elements):
-                    is_visible = await elem.is_visible()
-                    if not is_visible:
-                        continue
-
-                    text = (await elem.inner_text()).strip()
-                    if text and len(text) < 100:
-                        all_navigation.append({
-                            'type': 'broad_selector',
-                            'selector': selector,
-                            'index': i,
-                            'text': text,
-                            'element': elem
-                        })
-
-            except Exception as e:
-                self.logger.debug(f"Error with selector {selector}: {e}")
-
         # Strategy 2: Custom buttons
-        custom_buttons = await self.detect_custom_buttons()
-        all_navigation.extend(custom_buttons)
-
-        # Deduplicate
-        seen = set()
-        unique = []
-        for nav in all_navigation:
-            key = nav['text']
-            if key not in seen:
-                seen.add(key)
-                unique.append(nav)
+        unique = await self._scan(_BROAD_SELECTOR_GROUPS + _CUSTOM_BUTTON_GROUPS)
 
         self.logger.info(f"Found {len(unique)} total navigation elements")
         return unique
@@ -2,20 +2,140 @@
 Data extraction module for extracting tables, text, and metrics from pages
 """
 
+import asyncio
 import logging
-import re
-from typing import Dict, List, Any
+from itertools import islice
+from typing import TYPE_CHECKING, Dict, List, Any, Optional
 
-from bs4 import BeautifulSoup
-from playwright.async_api import Page
+from bs4 import BeautifulSoup, SoupStrainer
 
 from . import config
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# Prefer the C-backed lxml parser; html.parser ships with Python
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# A metric's text must contain at least one digit
+_DIGITS = frozenset('0123456789')
+
+# Selector lists joined into one CSS union so each is matched in a single pass
+_SECTION_SELECTOR = ', '.join(config.SECTION_TAGS)
+_METRIC_SELECTOR = ', '.join(config.METRIC_SELECTORS)
+_SCRIPT_AND_SECTION_SELECTOR = ', '.join(['script', 'style'] + config.SECTION_TAGS)
+
+_HEADING_TAGS = frozenset(('h1', 'h2', 'h3', 'h4', 'h5', 'h6'))
+
+# Table-only parsing skips building the rest of the tree
+_TABLES_ONLY = SoupStrainer('table')
+
+# Extracts the requested parts in the browser so only the results cross the
+# CDP connection; mirrors the Python extractors below, which remain as fallback.
+# Text sections and metrics come back as [name, value] pairs to keep their order.
+_PAGE_DATA_JS = """
+({parts, sectionSelector, metricSelector}) => {
+    // Same as BeautifulSoup get_text(separator, strip=True), minus script/style
+    const textOf = (root, separator = '') => {
+        const pieces = [];
+        const walker = document.createTreeWalker(root, NodeFilter.SHOW_TEXT);
+        for (let node = walker.nextNode(); node; node = walker.nextNode()) {
+            const parent = node.parentElement;
+            if (parent && parent.closest('script, style')) continue;
+            const text = node.nodeValue.trim();
+            if (text) pieces.push(text);
+        }
+        return pieces.join(separator);
+    };
+    const cellTexts = row => Array.from(row.children)
+        .filter(cell => cell.tagName === 'TD' || cell.tagName === 'TH')
+        .map(cell => textOf(cell));
+
+    const data = {};
+
+    if (parts.includes('tables')) {
+        data.tables = [];
+        document.querySelectorAll('table').forEach((table, i) => {
+            const thead = table.querySelector('thead');
+            let headers = [];
+            const headerRow = thead && thead.querySelector('tr');
+            if (headerRow) headers = cellTexts(headerRow);
+            if (!headers.length) {
+                const firstRow = table.querySelector('tr');
+                if (firstRow) headers = cellTexts(firstRow);
+            }
+
+            const tbody = table.querySelector('tbody');
+            const rowElements = Array.from((tbody || table).querySelectorAll('tr'));
+            // Skip first row if it was used as header and there's no thead
+            const start = !thead && headers.length ? 1 : 0;
+
+            const rows = rowElements.slice(start).map(cellTexts).filter(row => row.some(Boolean));
+            if (rows.length || headers.length) {
+                data.tables.push({
+                    table_id: i + 1,
+                    headers,
+                    rows,
+                    row_count: rows.length,
+                    column_count: headers.length || (rows.length ? rows[0].length : 0)
+                });
+            }
+        });
+    }
+
+    if (parts.includes('metrics')) {
+        data.metrics = [];
+        // Candidate label texts, read once per parent
+        const labelTexts = new Map();
+        document.querySelectorAll(metricSelector).forEach(el => {
+            const text = textOf(el);
+            if (!/\\d/.test(text)) return;
+
+            let label = null;
+            const parent = el.parentElement;
+            if (parent) {
+                if (!labelTexts.has(parent)) {
+                    labelTexts.set(parent, Array.from(
+                        parent.querySelectorAll('span, div, p, label'), sib => textOf(sib)
+                    ));
+                }
+                label = labelTexts.get(parent).find(sibText => sibText && sibText !== text) || null;
+            }
+            data.metrics.push([label || `metric_${data.metrics.length}`, text]);
+        });
+    }
+
+    if (parts.includes('text_sections')) {
+        data.text_sections = [];
+        document.querySelectorAll(sectionSelector).forEach(el => {
+            const text = textOf(el, ' ');
+            if (text.length <= 20) return;  // Ignore very short sections
+
+            const heading = el.querySelector('h1, h2, h3, h4, h5, h6');
+            const name = heading ? textOf(heading) : `section_${data.text_sections.length}`;
+            data.text_sections.push([name, text]);
+        });
+
+        // If no sections found, get main content
+        if (!data.text_sections.length) {
+            const main = document.querySelector('main') || document.body;
+            if (main) data.text_sections.push(['main_content', textOf(main, ' ')]);
+        }
+    }
+
+    return data;
+}
+"""
+
 
 class DataExtractor:
     """Extracts all data from the current page state"""
 
-    def __init__(self, page: Page, logger: logging.Logger):
+    def __init__(self, page: 'Page', logger: logging.Logger):
         """
         Initialize DataExtractor
 
@@ -26,6 +146,31 @@ class DataExtractor:
         self.page = page
         self.logger = logger
 
+    async def _extract_in_page(self, *parts: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract the given parts inside the browser
+
+        Args:
+            parts: Any of 'tables', 'text_sections' and 'metrics'
+
+        Returns:
+            Dictionary of extracted parts, or None if the script failed
+        """
+        try:
+            data = await self.page.evaluate(_PAGE_DATA_JS, {
+                'parts': list(parts),
+                'sectionSelector': _SECTION_SELECTOR,
+                'metricSelector': _METRIC_SELECTOR
+            })
+        except Exception as e:
+            self.logger.debug(f"In-page extraction failed, parsing page content: {e}")
+            return None
+
+        for part in ('text_sections', 'metrics'):
+            if part in data:
+                data[part] = dict(data[part])
+        return data
+
     async def extract_tables(self) -> List[Dict[str, Any]]:
         """
         Extract all tables from the page
@@ -33,30 +178,51 @@ class DataExtractor:
         Returns:
             List of dictionaries containing table data with headers and rows
         """
-        tables = []
+        data = await self._extract_in_page('tables')
+        if data is not None:
+            return data['tables']
 
         try:
             html = await self.page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+        except Exception as e:
+            self.logger.error(f"Error in extract_tables: {e}")
+            return []
+
+        return await asyncio.to_thread(self._parse_tables, html)
+
+    def _parse_tables(self, html: str) -> List[Dict[str, Any]]:
+        """Parse only the page's tables and extract them"""
+        return self._extract_tables_from_soup(BeautifulSoup(html, HTML_PARSER, parse_only=_TABLES_ONLY))
+
+    @staticmethod
+    def _build_table(index: int, headers: List[str], rows: List[List[str]]) -> Dict[str, Any]:
+        """Build the output dictionary for one table"""
+        return {
+            'table_id': index + 1,
+            'headers': headers,
+            'rows': rows,
+            'row_count': len(rows),
+            'column_count': len(headers) if headers else (
+                len(rows[0]) if rows else 0
+            )
+        }
+
+    def _extract_tables_from_soup(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
+        """Extract all tables from a parsed page"""
+        tables = []
 
+        try:
             table_elements = soup.find_all('table')
             self.logger.debug(f"Found {len(table_elements)} table elements")
 
             for i, table in enumerate(table_elements):
                 try:
-                    headers = self._extract_table_headers(table)
-                    rows = self._extract_table_rows(table, has_thead=bool(table.find('thead')))
+                    thead = table.find('thead')
+                    headers = self._extract_table_headers(table, thead)
+                    rows = self._extract_table_rows(table, thead, headers)
 
                     if rows or headers:
-                        tables.append({
-                            'table_id': i + 1,
-                            'headers': headers,
-                            'rows': rows,
-                            'row_count': len(rows),
-                            'column_count': len(headers) if headers else (
-                                len(rows[0]) if rows else 0
-                            )
-                        })
+                        tables.append(self._build_table(i, headers, rows))
 
                 except Exception as e:
                     self.logger.error(f"Error extracting table {i}: {e}")
@@ -66,44 +232,46 @@ class DataExtractor:
 
         return tables
 
-    def _extract_table_headers(self, table) -> List[str]:
+    @staticmethod
+    def _row_cell_texts(row) -> List[str]:
+        """Get the text of a row's direct td/th cells"""
+        return [
+            cell.get_text(strip=True) for cell in row.children
+            if getattr(cell, 'name', None) in ('td', 'th')
+        ]
+
+    def _extract_table_headers(self, table, thead) -> List[str]:
         """Extract headers from a table element"""
         headers = []
 
         # Try to find headers in thead
-        thead = table.find('thead')
         if thead:
-            header_rows = thead.find_all('tr')
-            if header_rows:
-                header_cells = header_rows[0].find_all(['th', 'td'])
-                headers = [cell.get_text(strip=True) for cell in header_cells]
+            header_row = thead.find('tr')
+            if header_row:
+                headers = self._row_cell_texts(header_row)
 
         # If no thead, try first row
         if not headers:
             first_row = table.find('tr')
             if first_row:
-                cells = first_row.find_all(['th', 'td'])
-                headers = [cell.get_text(strip=True) for cell in cells]
+                headers = self._row_cell_texts(first_row)
 
         return headers
 
-    def _extract_table_rows(self, table, has_thead: bool = False) -> List[List[str]]:
+    def _extract_table_rows(self, table, thead, headers: List[str]) -> List[List[str]]:
         """Extract rows from a table element"""
-        rows = []
-
         tbody = table.find('tbody')
         row_elements = tbody.find_all('tr') if tbody else table.find_all('tr')
 
         # Skip first row if it was used as header and there's no thead
-        start_idx = 1 if not has_thead and self._extract_table_headers(table) else 0
+        start_idx = 1 if thead is None and headers else 0
 
-        for row in row_elements[start_idx:]:
-            cells = row.find_all(['td', 'th'])
-            row_data = [cell.get_text(strip=True) for cell in cells]
-            if any(row_data):  # Only add non-empty rows
-                rows.append(row_data)
-
-        return rows
+        # Only keep non-empty rows
+        return [
+            row_data
+            for row_data in map(self._row_cell_texts, islice(row_elements, start_idx, None))
+            if any(row_data)
+        ]
 
     async def extract_text_sections(self) -> Dict[str, str]:
         """
@@ -112,27 +280,48 @@ class DataExtractor:
         Returns:
             Dictionary mapping section names to text content
         """
-        sections = {}
+        data = await self._extract_in_page('text_sections')
+        if data is not None:
+            return data['text_sections']
 
         try:
             html = await self.page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+        except Exception as e:
+            self.logger.error(f"Error extracting text sections: {e}")
+            return {}
+
+        return await asyncio.to_thread(self._parse_text_sections, html)
+
+    def _parse_text_sections(self, html: str) -> Dict[str, str]:
+        """Parse the page and extract text sections"""
+        return self._extract_text_sections_from_soup(BeautifulSoup(html, HTML_PARSER))
+
+    def _extract_text_sections_from_soup(self, soup: BeautifulSoup) -> Dict[str, str]:
+        """
+        Extract text sections from a parsed page
 
-            # Remove script and style elements
-            for script in soup(["script", "style"]):
-                script.decompose()
+        Note: strips script/style elements from the soup in place.
+        """
+        sections = {}
+
+        try:
+            # Find script/style elements and semantic sections in one pass,
+            # removing script/style before any section text is read
+            section_elements = []
+            for elem in soup.select(_SCRIPT_AND_SECTION_SELECTOR):
+                if elem.name in ('script', 'style'):
+                    elem.decompose()
+                else:
+                    section_elements.append(elem)
 
-            # Try to find semantic sections
             section_count = 0
-            for tag in config.SECTION_TAGS:
-                elements = soup.select(tag)
-                for elem in elements:
-                    section_name = self._get_section_name(elem, section_count)
-                    text = elem.get_text(separator=' ', strip=True)
+            for elem in section_elements:
+                section_name = self._get_section_name(elem, section_count)
+                text = elem.get_text(separator=' ', strip=True)
 
-                    if text and len(text) > 20:  # Ignore very short sections
-                        sections[section_name] = text
-                        section_count += 1
+                if text and len(text) > 20:  # Ignore very short sections
+                    sections[section_name] = text
+                    section_count += 1
 
             # If no sections found, get main content
             if not sections:
@@ -147,10 +336,10 @@ class DataExtractor:
 
     def _get_section_name(self, element, default_index: int) -> str:
         """Get a name for a section element"""
-        # Try to find a heading
-        heading = element.find(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-        if heading:
-            return heading.get_text(strip=True)
+        # Try to find a heading; a plain walk avoids building a find() filter per call
+        for descendant in element.descendants:
+            if descendant.name in _HEADING_TAGS:
+                return descendant.get_text(strip=True)
         return f"section_{default_index}"
 
     async def extract_metrics(self) -> Dict[str, Any]:
@@ -160,43 +349,88 @@ class DataExtractor:
         Returns:
             Dictionary mapping metric names to values
         """
-        metrics = {}
+        data = await self._extract_in_page('metrics')
+        if data is not None:
+            return data['metrics']
 
         try:
             html = await self.page.content()
-            soup = BeautifulSoup(html, 'html.parser')
+        except Exception as e:
+            self.logger.error(f"Error extracting metrics: {e}")
+            return {}
+
+        return await asyncio.to_thread(self._parse_metrics, html)
 
+    def _parse_metrics(self, html: str) -> Dict[str, Any]:
+        """Parse the page and extract metrics/KPIs"""
+        return self._extract_metrics_from_soup(BeautifulSoup(html, HTML_PARSER))
+
+    def _extract_metrics_from_soup(self, soup: BeautifulSoup) -> Dict[str, Any]:
+        """Extract metrics/KPIs from a parsed page"""
+        metrics = {}
+
+        try:
             metric_count = 0
-            for selector in config.METRIC_SELECTORS:
-                elements = soup.select(selector)
-                for elem in elements:
-                    text = elem.get_text(strip=True)
-
-                    # Try to extract numbers
-                    numbers = re.findall(r'[\d,\.]+%?', text)
-                    if numbers:
-                        label = self._find_metric_label(elem)
-                        key = label if label else f"metric_{metric_count}"
-                        metrics[key] = text
-                        metric_count += 1
+            label_texts = {}
+            # The label depends only on the parent and the text, so repeated
+            # tiles with the same text under one parent share a lookup
+            labels = {}
+            for elem in soup.select(_METRIC_SELECTOR):
+                text = elem.get_text(strip=True)
+
+                # Skip empty elements and elements without any number
+                if text and not _DIGITS.isdisjoint(text):
+                    label_key = (id(elem.parent), text)
+                    if label_key in labels:
+                        label = labels[label_key]
+                    else:
+                        label = self._find_metric_label(elem, text, label_texts)
+                        labels[label_key] = label
+                    key = label if label else f"metric_{metric_count}"
+                    metrics[key] = text
+                    metric_count += 1
 
         except Exception as e:
             self.logger.error(f"Error extracting metrics: {e}")
 
         return metrics
 
-    def _find_metric_label(self, element) -> str:
-        """Try to find a label for a metric element"""
+    @staticmethod
+    def _find_metric_label(element, elem_text: str, label_texts: Dict[int, List[str]]) -> str:
+        """
+        Try to find a label for a metric element
+
+        Args:
+            element: Metric element
+            elem_text: Stripped text of the metric element
+            label_texts: Cache of candidate label texts keyed by id() of the parent
+        """
         parent = element.parent
         if parent:
-            siblings = parent.find_all(['span', 'div', 'p', 'label'])
-            for sib in siblings:
-                sib_text = sib.get_text(strip=True)
-                elem_text = element.get_text(strip=True)
+            texts = label_texts.get(id(parent))
+            if texts is None:
+                texts = [
+                    sib.get_text(strip=True)
+                    for sib in parent.find_all(['span', 'div', 'p', 'label'])
+                ]
+                label_texts[id(parent)] = texts
+
+            for sib_text in texts:
                 if sib_text and sib_text != elem_text:
                     return sib_text
         return None
 
+    def _parse_all(self, html: str) -> tuple:
+        """Extract tables, text sections and metrics from one parse of the page"""
+        soup = BeautifulSoup(html, HTML_PARSER)
+
+        tables = self._extract_tables_from_soup(soup)
+        # Metrics must run first: text section extraction strips script/style in place
+        metrics = self._extract_metrics_from_soup(soup)
+        text_sections = self._extract_text_sections_from_soup(soup)
+
+        return tables, text_sections, metrics
+
     async def extract_all_data(self) -> Dict[str, Any]:
         """
         Extract all data from current page state
@@ -206,9 +440,19 @@ class DataExtractor:
         """
         self.logger.debug("Extracting all data...")
 
-        tables = await self.extract_tables()
-        text_sections = await self.extract_text_sections()
-        metrics = await self.extract_metrics()
+        data = await self._extract_in_page('tables', 'metrics', 'text_sections')
+        if data is not None:
+            tables, text_sections, metrics = data['tables'], data['text_sections'], data['metrics']
+        else:
+            # Serialize the page once for all three extractors
+            try:
+                html = await self.page.content()
+            except Exception as e:
+                self.logger.error(f"Error reading page content: {e}")
+                html = ''
+
+            # Parse in a worker thread so the event loop keeps handling responses
+            tables, text_sections, metrics = await asyncio.to_thread(self._parse_all, html)
 
         self.logger.info(
             f"  └─ Extracted {len(tables)} tables, "
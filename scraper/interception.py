@@ -3,16 +3,21 @@ API interception module for capturing network requests and responses
 """
 
 import logging
+import time
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
-from playwright.async_api import Page, Response
+from . import config
+from .utils import json_loads
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page, Response
 
 
 class APIInterceptor:
     """Captures API requests and responses"""
 
-    def __init__(self, page: Page, logger: logging.Logger):
+    def __init__(self, page: 'Page', logger: logging.Logger):
         """
         Initialize APIInterceptor
 
@@ -28,30 +33,40 @@ class APIInterceptor:
     async def setup_request_interception(self):
         """Set up listeners for network requests"""
 
-        async def handle_response(response: Response):
+        async def handle_response(response: 'Response'):
             """Handle each response and capture JSON responses"""
+            # Bind the current view's list before any await; clear_captured_data swaps it
+            captured = self.captured_requests
             try:
                 # Only capture JSON responses
-                content_type = response.headers.get('content-type', '')
-                if 'json' in content_type.lower():
-                    url = response.url
-                    method = response.request.method
-
-                    # Try to get response body
+                headers = response.headers
+                if 'json' not in headers.get('content-type', '').lower():
+                    return
+
+                url = response.url
+                method = response.request.method
+
+                # Fetch the body once; keep it as text if it is not valid JSON
+                content_length = headers.get('content-length', '')
+                if content_length.isdigit() and int(content_length) > config.MAX_CAPTURE_BODY_BYTES:
+                    self.logger.debug(f"Skipping body of large response ({content_length} bytes): {url}")
+                    body = None
+                else:
+                    body_bytes = await response.body()
                     try:
-                        body = await response.json()
-                    except:
-                        body = await response.text()
+                        body = json_loads(body_bytes)
+                    except Exception:
+                        body = body_bytes.decode('utf-8', 'replace')
 
-                    self.captured_requests.append({
-                        'url': url,
-                        'method': method,
-                        'status': response.status,
-                        'response': body,
-                        'timestamp': datetime.now().isoformat()
-                    })
+                captured.append({
+                    'url': url,
+                    'method': method,
+                    'status': response.status,
+                    'response': body,
+                    'timestamp': time.time()  # formatted in get_captured_data
+                })
 
-                    self.logger.debug(f"Captured API response: {method} {url}")
+                self.logger.debug(f"Captured API response: {method} {url}")
 
             except Exception as e:
                 self.logger.debug(f"Error capturing response: {e}")
@@ -63,9 +78,12 @@ class APIInterceptor:
         Get all captured API data
 
         Returns:
-            List of captured API requests with responses
+            List of captured API requests with responses and ISO timestamps
         """
-        return self.captured_requests
+        return [
+            {**capture, 'timestamp': datetime.fromtimestamp(capture['timestamp']).isoformat()}
+            for capture in self.captured_requests
+        ]
 
     def clear_captured_data(self):
         """Clear captured data for next view"""
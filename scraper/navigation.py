@@ -4,18 +4,125 @@ Navigation module for detecting and handling page navigation elements
 
 import asyncio
 import logging
-from typing import Any, Dict, List, Set
-
-from playwright.async_api import Page
+from typing import TYPE_CHECKING, Any, Dict, List, Set
 
 from . import config
 from .utils import retry
 
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+# All tab selectors as one CSS union, matched with a single query
+_TAB_SELECTOR = ', '.join(config.TAB_SELECTORS)
+
+# Collects the requested kinds of navigation element in a single page.evaluate,
+# tagging each match with a data-<kind>-id attribute for later clicks
+_ELEMENT_SCAN_JS = """
+({kinds, tabSelector}) => {
+    const isVisible = el => {
+        const box = el.getBoundingClientRect();
+        return box.width > 0 && box.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+
+    const tagger = kind => {
+        const attr = `data-${kind}-id`;
+        document.querySelectorAll(`[${attr}]`).forEach(el => el.removeAttribute(attr));
+        let nextId = 0;
+        return el => {
+            if (!el.hasAttribute(attr)) el.setAttribute(attr, nextId++);
+            return el.getAttribute(attr);
+        };
+    };
+
+    const result = {};
+    if (kinds.includes('tab')) {
+        const tag = tagger('tab');
+        const matches = [];
+        // Deduplicate by whitespace/case-normalized text, checked before visibility
+        const seenTexts = new Set();
+        document.querySelectorAll(tabSelector).forEach((el, index) => {
+            const text = (el.innerText || '').trim();
+            // Ignore very long text (likely not a tab)
+            if (!text || text.length >= 100) return;
+
+            const key = text.split(/\\s+/).join(' ').toLowerCase();
+            if (seenTexts.has(key) || !isVisible(el)) return;
+
+            seenTexts.add(key);
+            matches.push({index, text, id: tag(el)});
+        });
+        result.tab = matches;
+    }
+    if (kinds.includes('expandable')) {
+        const tag = tagger('expandable');
+        const matches = [];
+        document.querySelectorAll('[aria-expanded="false"]').forEach((el, index) => {
+            if (isVisible(el)) {
+                matches.push({type: 'expandable', index, text: (el.innerText || '').slice(0, 50), id: tag(el)});
+            }
+        });
+        document.querySelectorAll('details:not([open])').forEach((el, index) => {
+            const summary = el.querySelector('summary');
+            if (summary) {
+                matches.push({type: 'details', index, text: summary.innerText, id: tag(el)});
+            }
+        });
+        result.expandable = matches;
+    }
+    if (kinds.includes('select')) {
+        const tag = tagger('select');
+        const matches = [];
+        document.querySelectorAll('select').forEach((el, index) => {
+            if (isVisible(el)) {
+                const options = Array.from(el.querySelectorAll('option'), opt => opt.innerText);
+                matches.push({index, options, id: tag(el)});
+            }
+        });
+        result.select = matches;
+    }
+    return result;
+}
+"""
+
+# Indices of elements whose text is a page number
+_PAGE_NUMBER_INDICES_JS = "els => els.flatMap((el, i) => /^\\d+$/.test((el.innerText || '').trim()) ? [i] : [])"
+
+# Whether an expandable element is still collapsed
+_IS_COLLAPSED_JS = "el => el.tagName === 'DETAILS' ? !el.open : el.getAttribute('aria-expanded') === 'false'"
+
+# Records the time of the latest added or removed node; installed before page scripts run.
+# Attribute and text changes are ignored so charts, clocks and spinners do not keep it busy.
+_MUTATION_TRACKER_JS = """
+window.__lastDomMutation = performance.now();
+new MutationObserver(() => { window.__lastDomMutation = performance.now(); })
+    .observe(document, {childList: true, subtree: true});
+"""
+
+# True once no element matching any of the loading selectors is visible
+_LOADING_DONE_JS = """
+selectors => selectors.every(selector => Array.from(document.querySelectorAll(selector)).every(el => {
+    const box = el.getBoundingClientRect();
+    return box.width === 0 || box.height === 0 || getComputedStyle(el).visibility === 'hidden';
+}))
+"""
+
+# True once the document has loaded and the DOM has not changed for quietMs
+_DOM_QUIET_JS = """
+quietMs => document.readyState === 'complete'
+    && performance.now() - (window.__lastDomMutation || 0) >= quietMs
+"""
+
+# Whether a pagination button is disabled, by attribute, property or class
+_IS_DISABLED_JS = """
+el => el.hasAttribute('disabled') || el.disabled === true
+    || (el.getAttribute('class') || '').toLowerCase().includes('disabled')
+"""
+
 
 class NavigationDetector:
     """Detects all navigation elements on a page (tabs, pagination, expandables)"""
 
-    def __init__(self, page: Page, logger: logging.Logger):
+    def __init__(self, page: 'Page', logger: logging.Logger):
         """
         Initialize NavigationDetector
 
@@ -26,6 +133,14 @@ class NavigationDetector:
         self.page = page
         self.logger = logger
 
+    async def _scan(self, *kinds: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Run the element scan for the given kinds ('tab', 'expandable', 'select')"""
+        return await self.page.evaluate(_ELEMENT_SCAN_JS, {'kinds': list(kinds), 'tabSelector': _TAB_SELECTOR})
+
+    def _locator(self, kind: str, element_id: str):
+        """Locator for an element tagged by _scan"""
+        return self.page.locator(f'[data-{kind}-id="{element_id}"]')
+
     async def detect_tabs(self) -> List[Dict[str, Any]]:
         """
         Detect all tab elements on the page
@@ -33,43 +148,24 @@ class NavigationDetector:
         Returns:
             List of dictionaries containing tab information
         """
-        tabs = []
-
-        for selector in config.TAB_SELECTORS:
-            try:
-                elements = await self.page.query_selector_all(selector)
-                for i, elem in enumerate(elements):
-                    text = await elem.inner_text()
-                    text = text.strip()
-
-                    # Ignore very long text (likely not a tab)
-                    if text and len(text) < 100:
-                        is_visible = await elem.is_visible()
-                        if is_visible:
-                            tabs.append({
-                                'type': 'tab',
-                                'selector': selector,
-                                'index': i,
-                                'text': text,
-                                'element': elem
-                            })
-            except Exception as e:
-                self.logger.debug(f"No elements found for selector {selector}: {e}")
-
-        # Deduplicate by text
-        return self._deduplicate_tabs(tabs)
-
-    def _deduplicate_tabs(self, tabs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Remove duplicate tabs based on text"""
-        seen_texts = set()
-        unique_tabs = []
-
-        for tab in tabs:
-            if tab['text'] not in seen_texts:
-                seen_texts.add(tab['text'])
-                unique_tabs.append(tab)
-
-        return unique_tabs
+        try:
+            return self._build_tabs((await self._scan('tab'))['tab'])
+        except Exception as e:
+            self.logger.debug(f"No tab elements found: {e}")
+            return []
+
+    def _build_tabs(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build tab dictionaries from scan matches"""
+        return [
+            {
+                'type': 'tab',
+                'selector': _TAB_SELECTOR,
+                'index': match['index'],
+                'text': match['text'],
+                'element': self._locator('tab', match['id'])
+            }
+            for match in matches
+        ]
 
     async def detect_pagination(self) -> Dict[str, Any]:
         """
@@ -106,15 +202,11 @@ class NavigationDetector:
             except:
                 pass
 
-        # Look for page numbers
+        # Look for page numbers, reading all candidate texts in one call
         try:
-            page_num_elems = await self.page.query_selector_all(
-                '.pagination button, .pagination a'
-            )
-            for elem in page_num_elems:
-                text = await elem.inner_text()
-                if text.strip().isdigit():
-                    pagination['page_numbers'].append(elem)
+            page_num_elems = self.page.locator('.pagination button, .pagination a')
+            indices = await page_num_elems.evaluate_all(_PAGE_NUMBER_INDICES_JS)
+            pagination['page_numbers'] = [page_num_elems.nth(i) for i in indices]
         except:
             pass
 
@@ -127,40 +219,24 @@ class NavigationDetector:
         Returns:
             List of dictionaries containing expandable section information
         """
-        expandables = []
-
-        # Look for elements with aria-expanded
+        # Elements with aria-expanded, then closed details/summary elements
         try:
-            elements = await self.page.query_selector_all('[aria-expanded="false"]')
-            for i, elem in enumerate(elements):
-                if await elem.is_visible():
-                    text = await elem.inner_text()
-                    expandables.append({
-                        'type': 'expandable',
-                        'index': i,
-                        'text': text[:50] if text else '',
-                        'element': elem
-                    })
+            return self._build_expandables((await self._scan('expandable'))['expandable'])
         except Exception as e:
             self.logger.debug(f"Error detecting expandables: {e}")
-
-        # Look for details/summary elements
-        try:
-            details = await self.page.query_selector_all('details:not([open])')
-            for i, elem in enumerate(details):
-                summary = await elem.query_selector('summary')
-                if summary:
-                    text = await summary.inner_text()
-                    expandables.append({
-                        'type': 'details',
-                        'index': i,
-                        'text': text,
-                        'element': elem
-                    })
-        except Exception as e:
-            self.logger.debug(f"Error detecting details: {e}")
-
-        return expandables
+            return []
+
+    def _build_expandables(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build expandable section dictionaries from scan matches"""
+        return [
+            {
+                'type': match['type'],
+                'index': match['index'],
+                'text': match['text'],
+                'element': self._locator('expandable', match['id'])
+            }
+            for match in matches
+        ]
 
     async def detect_dropdowns(self) -> List[Dict[str, Any]]:
         """
@@ -169,30 +245,32 @@ class NavigationDetector:
         Returns:
             List of dictionaries containing dropdown information
         """
-        dropdowns = []
-
+        # Native select elements
         try:
-            # Native select elements
-            selects = await self.page.query_selector_all('select')
-            for i, elem in enumerate(selects):
-                if await elem.is_visible():
-                    options = await elem.query_selector_all('option')
-                    option_texts = []
-
-                    for opt in options:
-                        text = await opt.inner_text()
-                        option_texts.append(text)
-
-                    dropdowns.append({
-                        'type': 'select',
-                        'index': i,
-                        'element': elem,
-                        'options': option_texts
-                    })
+            return self._build_dropdowns((await self._scan('select'))['select'])
         except Exception as e:
             self.logger.debug(f"Error detecting dropdowns: {e}")
-
-        return dropdowns
+            return []
+
+    def _build_dropdowns(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Build dropdown dictionaries from scan matches"""
+        return [
+            {
+                'type': 'select',
+                'index': match['index'],
+                'element': self._locator('select', match['id']),
+                'options': match['options']
+            }
+            for match in matches
+        ]
+
+    async def _scan_navigation(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Scan tabs, expandables and dropdowns together, empty on failure"""
+        try:
+            return await self._scan('tab', 'expandable', 'select')
+        except Exception as e:
+            self.logger.debug(f"Error detecting navigation elements: {e}")
+            return {'tab': [], 'expandable': [], 'select': []}
 
     async def get_all_navigation_elements(self) -> Dict[str, Any]:
         """
@@ -203,10 +281,16 @@ class NavigationDetector:
         """
         self.logger.info("Detecting navigation elements...")
 
-        tabs = await self.detect_tabs()
-        pagination = await self.detect_pagination()
-        expandables = await self.detect_expandable_sections()
-        dropdowns = await self.detect_dropdowns()
+        # One scan for tabs, expandables and dropdowns, concurrent with pagination
+        # detection (its Playwright-only selectors cannot run in page JS)
+        scan, pagination = await asyncio.gather(
+            self._scan_navigation(),
+            self.detect_pagination()
+        )
+
+        tabs = self._build_tabs(scan['tab'])
+        expandables = self._build_expandables(scan['expandable'])
+        dropdowns = self._build_dropdowns(scan['select'])
 
         self.logger.info(
             f"Detected: {len(tabs)} tabs, "
@@ -222,11 +306,36 @@ class NavigationDetector:
             'dropdowns': dropdowns
         }
 
+    async def get_tab_local_elements(self) -> Dict[str, Any]:
+        """
+        Get the navigation elements that change with the selected tab
+
+        The tab list itself is detected once, so only expandable sections
+        and pagination are scanned here.
+
+        Returns:
+            Dictionary containing expandables and pagination
+        """
+        expandables, pagination = await asyncio.gather(
+            self.detect_expandable_sections(),
+            self.detect_pagination()
+        )
+
+        self.logger.debug(
+            f"Tab has {len(expandables)} expandable sections, "
+            f"pagination: {pagination['has_pagination']}"
+        )
+
+        return {
+            'pagination': pagination,
+            'expandables': expandables
+        }
+
 
 class PageNavigator:
     """Orchestrates systematic navigation through all page states"""
 
-    def __init__(self, page: Page, logger: logging.Logger, timeout: int = config.DEFAULT_TIMEOUT):
+    def __init__(self, page: 'Page', logger: logging.Logger, timeout: int = config.DEFAULT_TIMEOUT):
         """
         Initialize PageNavigator
 
@@ -240,26 +349,55 @@ class PageNavigator:
         self.timeout = timeout
         self.visited_states: Set[str] = set()
 
+    async def track_dom_mutations(self):
+        """Install the DOM mutation tracker used by wait_for_page_stability"""
+        await self.page.add_init_script(_MUTATION_TRACKER_JS)
+
+    async def load_page(self, url: str):
+        """
+        Navigate to a URL and wait for the dashboard's ready element
+
+        Args:
+            url: URL to load
+        """
+        await self.page.goto(url, wait_until='domcontentloaded', timeout=self.timeout)
+        await self.page.wait_for_selector(config.READY_SELECTOR, timeout=self.timeout)
+
     @retry(max_attempts=config.MAX_RETRY_ATTEMPTS, delay=config.RETRY_DELAY)
-    async def wait_for_page_stability(self):
-        """Wait for page to be fully loaded and stable"""
+    async def wait_for_page_stability(self, network_idle: bool = True):
+        """
+        Wait for page to be fully loaded and stable
+
+        Args:
+            network_idle: Wait for network idle first; skip it right after
+                load_page, whose ready selector already covers the load
+        """
         try:
             # Wait for network to be idle
-            await self.page.wait_for_load_state('networkidle', timeout=self.timeout)
+            if network_idle:
+                await self.page.wait_for_load_state('networkidle', timeout=self.timeout)
 
             # Wait for common loading indicators to disappear
-            for selector in config.LOADING_SELECTORS:
-                try:
-                    await self.page.wait_for_selector(
-                        selector,
-                        state='hidden',
-                        timeout=config.ELEMENT_WAIT_TIMEOUT
-                    )
-                except:
-                    pass  # Selector might not exist
-
-            # Additional stabilization wait
-            await asyncio.sleep(config.STABILIZATION_WAIT)
+            try:
+                await self.page.wait_for_function(
+                    _LOADING_DONE_JS,
+                    arg=config.LOADING_SELECTORS,
+                    polling=50,
+                    timeout=config.ELEMENT_WAIT_TIMEOUT
+                )
+            except Exception as e:
+                self.logger.debug(f"Loading indicators still visible: {e}")
+
+            # Wait for the DOM to stop changing
+            try:
+                await self.page.wait_for_function(
+                    _DOM_QUIET_JS,
+                    arg=config.DOM_QUIET_PERIOD,
+                    polling=100,
+                    timeout=config.STABILIZATION_TIMEOUT
+                )
+            except Exception as e:
+                self.logger.debug(f"DOM still changing after stabilization timeout: {e}")
 
         except Exception as e:
             self.logger.warning(f"Page stability wait timed out: {e}")
@@ -288,21 +426,13 @@ class PageNavigator:
             try:
                 elem = expandable['element']
 
-                if expandable['type'] == 'expandable':
-                    # Check if not already expanded
-                    is_expanded = await elem.get_attribute('aria-expanded')
-                    if is_expanded == 'false':
+                # Check if not already expanded/open
+                if await elem.evaluate(_IS_COLLAPSED_JS):
+                    if expandable['type'] == 'details':
+                        await elem.locator('summary').first.click()
+                    else:
                         await elem.click()
-                        await self.wait_for_page_stability()
-
-                elif expandable['type'] == 'details':
-                    # Check if not already open
-                    is_open = await elem.get_attribute('open')
-                    if not is_open:
-                        summary = await elem.query_selector('summary')
-                        if summary:
-                            await summary.click()
-                            await self.wait_for_page_stability()
+                    await self.wait_for_page_stability()
 
                 self.logger.debug(f"Expanded section: {expandable['text']}")
 
@@ -329,13 +459,7 @@ class PageNavigator:
                 next_btn = pagination['next_button']
 
                 # Check if next button is disabled
-                is_disabled = await next_btn.get_attribute('disabled')
-                if is_disabled:
-                    break
-
-                # Check if button has class indicating disabled state
-                classes = await next_btn.get_attribute('class') or ''
-                if 'disabled' in classes.lower():
+                if await next_btn.evaluate(_IS_DISABLED_JS):
                     break
 
                 # Click next
@@ -0,0 +1,120 @@
+"""
+Page pool for scraping several views of a dashboard concurrently
+"""
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, List
+
+from . import config
+from .extraction import DataExtractor
+from .interception import APIInterceptor
+from .navigation import NavigationDetector, PageNavigator
+
+if TYPE_CHECKING:
+    from playwright.async_api import BrowserContext, Page
+
+
+class PageSession:
+    """A page together with the components that operate on it"""
+
+    def __init__(self, page: 'Page', logger: logging.Logger, timeout: int = config.DEFAULT_TIMEOUT):
+        """
+        Initialize PageSession
+
+        Args:
+            page: Playwright page instance
+            logger: Logger instance
+            timeout: Timeout for page operations in milliseconds
+        """
+        self.page = page
+        self.nav_detector = NavigationDetector(page, logger)
+        self.data_extractor = DataExtractor(page, logger)
+        self.api_interceptor = APIInterceptor(page, logger)
+        self.page_navigator = PageNavigator(page, logger, timeout)
+
+    async def setup(self):
+        """Set up API interception and DOM mutation tracking"""
+        await self.api_interceptor.setup_request_interception()
+        await self.page_navigator.track_dom_mutations()
+
+
+class PagePool:
+    """Bounded pool of page sessions opened in a shared browser context"""
+
+    def __init__(
+        self,
+        context: 'BrowserContext',
+        logger: logging.Logger,
+        size: int = config.MAX_CONCURRENT_PAGES,
+        timeout: int = config.DEFAULT_TIMEOUT
+    ):
+        """
+        Initialize PagePool
+
+        Args:
+            context: Browser context the pages are opened in
+            logger: Logger instance
+            size: Maximum number of pages open at once
+            timeout: Timeout for page operations in milliseconds
+        """
+        self.context = context
+        self.logger = logger
+        self.size = size
+        self.timeout = timeout
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._pages: List['Page'] = []
+        self._opened = 0
+
+    async def _create_session(self) -> PageSession:
+        """Open a new page in the shared context"""
+        page = await self.context.new_page()
+        self._pages.append(page)
+
+        session = PageSession(page, self.logger, self.timeout)
+        await session.setup()
+        return session
+
+    async def acquire(self) -> PageSession:
+        """
+        Get an idle session, opening a new one while below the pool size
+
+        Returns:
+            PageSession with cleared API capture data
+        """
+        if self._idle.empty() and self._opened < self.size:
+            # Count the slot before awaiting so concurrent callers respect the limit
+            self._opened += 1
+            try:
+                session = await self._create_session()
+            except Exception:
+                self._opened -= 1
+                raise
+        else:
+            session = await self._idle.get()
+
+        session.api_interceptor.clear_captured_data()
+        return session
+
+    def release(self, session: PageSession):
+        """Return a session to the pool"""
+        self._idle.put_nowait(session)
+
+    @asynccontextmanager
+    async def session(self):
+        """Acquire a session for the duration of a with block"""
+        session = await self.acquire()
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+    async def close(self):
+        """Close all pages opened by the pool"""
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing pooled page: {e}")
+        self._pages = []
@@ -2,19 +2,26 @@
 Main scraper module that coordinates all components
 """
 
-import json
+import asyncio
+import csv
+import hashlib
 import logging
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Optional
-
-from playwright.async_api import async_playwright, Browser, Page
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 from . import config
 from .extraction import DataExtractor
 from .interception import APIInterceptor
 from .navigation import NavigationDetector, PageNavigator
-from .utils import sanitize_filename, setup_directories, setup_logging, count_data_points
+from .page_pool import PagePool, PageSession
+from .utils import iso_now, json_dumps, sanitize_filename, setup_directories, setup_logging, count_data_points
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, BrowserContext, Page
+
+# Visible text of the view, used to tell apart views that share API data
+_BODY_TEXT_JS = "() => document.body ? document.body.innerText : ''"
 
 
 class DashboardScraper:
@@ -70,42 +77,89 @@ class DashboardScraper:
         }
 
         # Components (initialized later)
-        self.browser: Optional[Browser] = None
-        self.page: Optional[Page] = None
+        self.browser: Optional['Browser'] = None
+        self.context: Optional['BrowserContext'] = None
+        self.page: Optional['Page'] = None
         self.nav_detector: Optional[NavigationDetector] = None
         self.data_extractor: Optional[DataExtractor] = None
         self.api_interceptor: Optional[APIInterceptor] = None
         self.page_navigator: Optional[PageNavigator] = None
+        self.session: Optional[PageSession] = None
+        self.page_pool: Optional[PagePool] = None
+
+        # JSON filename of the first view seen for each content and API payload hash
+        self._view_hashes: Dict[bytes, str] = {}
+
+        # Background writers for JSON and CSV output (started with the browser)
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._io_pool: Optional[ThreadPoolExecutor] = None
 
     async def initialize_browser(self):
         """Initialize Playwright browser and components"""
         self.logger.info("Initializing browser...")
 
+        self._write_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._io_pool = ThreadPoolExecutor(max_workers=config.CSV_WRITE_WORKERS)
+
+        # Imported here so the CLI starts without loading Playwright
+        from playwright.async_api import async_playwright
+
         playwright = await async_playwright().start()
         self.browser = await playwright.chromium.launch(headless=self.headless)
-        self.page = await self.browser.new_page()
 
-        # Set viewport size
-        await self.page.set_viewport_size({
+        # One context with the viewport configured once; all pages are opened in it
+        self.context = await self.browser.new_context(viewport={
             'width': config.VIEWPORT_WIDTH,
             'height': config.VIEWPORT_HEIGHT
         })
+        self.page = await self.context.new_page()
 
         # Initialize components
-        self.nav_detector = NavigationDetector(self.page, self.logger)
-        self.data_extractor = DataExtractor(self.page, self.logger)
-        self.api_interceptor = APIInterceptor(self.page, self.logger)
-        self.page_navigator = PageNavigator(self.page, self.logger, self.timeout)
+        self.session = PageSession(self.page, self.logger, self.timeout)
+        self.nav_detector = self.session.nav_detector
+        self.data_extractor = self.session.data_extractor
+        self.api_interceptor = self.session.api_interceptor
+        self.page_navigator = self.session.page_navigator
+
+        # Setup API interception and DOM mutation tracking
+        await self.session.setup()
+
+        # Extra pages for scraping tabs concurrently
+        self.page_pool = PagePool(self.context, self.logger, config.MAX_CONCURRENT_PAGES, self.timeout)
+
+    async def _writer_loop(self):
+        """Write queued (path, bytes) items to disk until a None sentinel arrives"""
+        while True:
+            item = await self._write_queue.get()
+            if item is None:
+                break
+
+            path, payload = item
+            try:
+                await asyncio.to_thread(path.write_bytes, payload)
+            except Exception as e:
+                error_msg = f"Failed to write {path.name}: {e}"
+                self.logger.error(error_msg)
+                self.stats['errors'].append(error_msg)
 
-        # Setup API interception
-        await self.api_interceptor.setup_request_interception()
+    async def _flush_writes(self):
+        """Stop the background writer once every queued file has been written"""
+        if self._writer_task:
+            await self._write_queue.put(None)
+            await self._writer_task
+            self._writer_task = None
 
     async def save_page_data(
         self,
         view_name: str,
         data: Dict[str, Any],
-        screenshot_filename: str
-    ):
+        screenshot_filename: str,
+        view_number: int,
+        session: PageSession,
+        api_data: List[Dict[str, Any]]
+    ) -> str:
         """
         Save extracted data to JSON and optionally CSV
 
@@ -113,97 +167,160 @@ class DashboardScraper:
             view_name: Name of the current view
             data: Extracted data dictionary
             screenshot_filename: Name of the screenshot file
+            view_number: Sequence number of the view, used in file names
+            session: Page session the view was scraped from
+            api_data: API responses captured for the view
+
+        Returns:
+            Name of the JSON file
         """
         # Prepare data with metadata
         output_data = {
             'page_info': {
                 'view_name': view_name,
-                'url': self.page.url,
-                'timestamp': datetime.now().isoformat(),
+                'url': session.page.url,
+                'timestamp': iso_now(),
                 'screenshot': screenshot_filename
             },
             **data
         }
 
         # Add API data
-        api_data = self.api_interceptor.get_captured_data()
         if api_data:
             output_data['api_data'] = api_data
 
         # Save JSON
-        json_filename = (
-            f"page_{self.stats['views_scraped']}_"
-            f"{sanitize_filename(view_name)}.json"
-        )
+        json_filename = f"page_{view_number}_{sanitize_filename(view_name)}.json"
         json_path = self.data_dir / json_filename
 
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        # Serialize here, write in the background so the next view can start
+        payload = json_dumps(output_data)
+        await self._write_queue.put((json_path, payload))
 
         self.stats['files_generated']['json'].append(json_filename)
         self.logger.debug(f"Data saved to {json_filename}")
 
         # Save CSV if enabled
-        if self.export_csv and data.get('tables'):
-            self._save_tables_as_csv(data['tables'])
+        tables = data.get('tables', [])
+        if self.export_csv and tables:
+            await self._save_tables_as_csv(tables, view_number)
 
         # Update stats
-        self.stats['tables_extracted'] += len(data.get('tables', []))
-        self.stats['data_points'] += count_data_points(data.get('tables', []))
-
-    def _save_tables_as_csv(self, tables: list):
-        """Save tables to CSV files"""
-        try:
-            import pandas as pd
-        except ImportError:
-            self.logger.warning("pandas not available, skipping CSV export")
-            return
-
-        for i, table in enumerate(tables):
-            if table['rows']:
-                csv_filename = f"table_{self.stats['views_scraped']}_{i+1}.csv"
-                csv_path = self.data_dir / csv_filename
+        self.stats['tables_extracted'] += len(tables)
+        self.stats['data_points'] += count_data_points(tables)
+
+        return json_filename
+
+    @staticmethod
+    def _hash_view(api_data: List[Dict[str, Any]], body_text: str) -> bytes:
+        """Hash captured API responses and the view's visible text, ignoring capture timestamps"""
+        payload = json_dumps([
+            body_text,
+            [
+                [capture['url'], capture['method'], capture['status'], capture['response']]
+                for capture in api_data
+            ]
+        ])
+        return hashlib.blake2b(payload, digest_size=16).digest()
+
+    def _save_duplicate_view(self, view_name: str, view_number: int, session: PageSession, duplicate_of: str):
+        """Queue a small JSON stub for a view whose API data matches an earlier view"""
+        output_data = {
+            'page_info': {
+                'view_name': view_name,
+                'url': session.page.url,
+                'timestamp': iso_now(),
+                'duplicate_of': duplicate_of
+            }
+        }
 
-                try:
-                    df = pd.DataFrame(table['rows'], columns=table['headers'])
-                    df.to_csv(csv_path, index=False)
-                    self.stats['files_generated']['csv'].append(csv_filename)
-                except Exception as e:
-                    self.logger.error(f"Failed to save CSV: {e}")
+        json_filename = f"page_{view_number}_{sanitize_filename(view_name)}.json"
+        self._write_queue.put_nowait((self.data_dir / json_filename, json_dumps(output_data)))
+        self.stats['files_generated']['json'].append(json_filename)
 
-    async def scrape_current_view(self, view_name: str):
+    async def _save_tables_as_csv(self, tables: list, view_number: int):
+        """Save tables to CSV files, writing them in parallel on the I/O thread pool"""
+        loop = asyncio.get_running_loop()
+
+        csv_tables = [
+            (f"table_{view_number}_{i+1}.csv", table)
+            for i, table in enumerate(tables)
+            if table['rows']
+        ]
+        results = await asyncio.gather(*[
+            loop.run_in_executor(self._io_pool, self._write_csv, self.data_dir / csv_filename, table)
+            for csv_filename, table in csv_tables
+        ], return_exceptions=True)
+
+        for (csv_filename, _), result in zip(csv_tables, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to save CSV: {result}")
+            else:
+                self.stats['files_generated']['csv'].append(csv_filename)
+
+    @staticmethod
+    def _write_csv(csv_path: Path, table: Dict[str, Any]):
+        """Write one table to a CSV file"""
+        with open(csv_path, 'w', newline='', encoding='utf-8',
+                  buffering=config.WRITE_BUFFER_SIZE) as f:
+            writer = csv.writer(f)
+            if table['headers']:
+                writer.writerow(table['headers'])
+            writer.writerows(table['rows'])
+
+    async def scrape_current_view(self, view_name: str, session: Optional[PageSession] = None):
         """
         Scrape data from current page state
 
         Args:
             view_name: Name of the current view being scraped
+            session: Page session to scrape (defaults to the main page)
         """
+        session = session or self.session
+
+        # Views may be scraped concurrently, so take the number before any await
         self.stats['views_scraped'] += 1
+        view_number = self.stats['views_scraped']
 
-        self.logger.info(f"Scraping view {self.stats['views_scraped']}: \"{view_name}\"")
+        self.logger.info(f"Scraping view {view_number}: \"{view_name}\"")
 
         # Wait for stability
-        await self.page_navigator.wait_for_page_stability()
+        await session.page_navigator.wait_for_page_stability()
 
-        # Extract data
-        data = await self.data_extractor.extract_all_data()
+        # Skip extraction when the view shows the same content and API data as an earlier one;
+        # the text keeps views that only share background polls apart
+        api_data = session.api_interceptor.get_captured_data()
+        view_hash = None
+        if api_data:
+            body_text = await session.page.evaluate(_BODY_TEXT_JS)
+            view_hash = self._hash_view(api_data, body_text)
+        if view_hash in self._view_hashes:
+            duplicate_of = self._view_hashes[view_hash]
+            self.logger.info(f"  └─ Same content as {duplicate_of}, skipping extraction")
+            self._save_duplicate_view(view_name, view_number, session, duplicate_of)
+            session.api_interceptor.clear_captured_data()
+            return
 
-        # Take screenshot
-        screenshot_filename = (
-            f"page_{self.stats['views_scraped']}_"
-            f"{sanitize_filename(view_name)}.png"
-        )
+        # Extract data and take the screenshot concurrently; both only read the page
+        screenshot_filename = f"page_{view_number}_{sanitize_filename(view_name)}.png"
         screenshot_path = self.screenshot_dir / screenshot_filename
-        await self.page_navigator.take_screenshot(str(screenshot_path))
+        data, _ = await asyncio.gather(
+            session.data_extractor.extract_all_data(),
+            session.page_navigator.take_screenshot(str(screenshot_path))
+        )
         self.stats['files_generated']['screenshots'].append(screenshot_filename)
 
         self.logger.info(f"  └─ Screenshot saved: {screenshot_filename}")
 
         # Save data
-        await self.save_page_data(view_name, data, screenshot_filename)
+        json_filename = await self.save_page_data(
+            view_name, data, screenshot_filename, view_number, session, api_data
+        )
+        if view_hash is not None:
+            self._view_hashes.setdefault(view_hash, json_filename)
 
         # Clear API data for next view
-        self.api_interceptor.clear_captured_data()
+        session.api_interceptor.clear_captured_data()
 
     async def scrape(self):
         """Main scraping workflow"""
@@ -216,8 +333,8 @@ class DashboardScraper:
 
             # Load initial page
             self.logger.info(f"Loading page: {self.url}")
-            await self.page.goto(self.url, wait_until='networkidle', timeout=self.timeout)
-            await self.page_navigator.wait_for_page_stability()
+            await self.page_navigator.load_page(self.url)
+            await self.page_navigator.wait_for_page_stability(network_idle=False)
 
             # Detect navigation elements
             nav_elements = await self.nav_detector.get_all_navigation_elements()
@@ -231,7 +348,8 @@ class DashboardScraper:
             else:
                 await self._scrape_tabbed_interface(tabs)
 
-            # Generate summary
+            # Generate summary once every queued file is on disk
+            await self._flush_writes()
             await self.generate_summary()
 
             self._log_completion()
@@ -266,50 +384,76 @@ class DashboardScraper:
                 await self.scrape_current_view(f"Page {page_num}")
 
     async def _scrape_tabbed_interface(self, tabs: list):
-        """Scrape a page with tabs"""
+        """Scrape a page with tabs, several tabs at a time from the page pool"""
         self.logger.info(f"Navigating through {len(tabs)} tabs")
 
-        for i, tab in enumerate(tabs):
-            try:
-                tab_name = tab['text'] or f"Tab {i+1}"
-                self.logger.info(f"\nTab {i+1}/{len(tabs)}: \"{tab_name}\"")
+        await asyncio.gather(*[
+            self._scrape_one_tab(i, tab, len(tabs)) for i, tab in enumerate(tabs)
+        ])
+
+    async def _scrape_one_tab(self, i: int, tab: Dict[str, Any], total_tabs: int):
+        """
+        Open the target URL on a pooled page, select one tab and scrape it
+
+        Args:
+            i: Index of the tab
+            tab: Tab dictionary detected on the main page
+            total_tabs: Total number of tabs, for logging
+        """
+        tab_name = tab['text'] or f"Tab {i+1}"
+
+        try:
+            async with self.page_pool.session() as session:
+                self.logger.info(f"\nTab {i+1}/{total_tabs}: \"{tab_name}\"")
+
+                await session.page_navigator.load_page(self.url)
+                await session.page_navigator.wait_for_page_stability(network_idle=False)
+
+                # Find the same tab on this page; element handles are per page
+                page_tabs = await session.nav_detector.detect_tabs()
+                page_tab = next((t for t in page_tabs if t['text'] == tab['text']), None)
+                if page_tab is None:
+                    raise RuntimeError("tab not found after reload")
+
+                # Drop the reload's traffic but keep what the tab click triggers
+                session.api_interceptor.clear_captured_data()
 
                 # Click tab
-                await tab['element'].click()
-                await self.page_navigator.wait_for_page_stability()
+                await page_tab['element'].click()
+                await session.page_navigator.wait_for_page_stability()
 
-                # Re-detect navigation elements for this tab
-                nav_elements = await self.nav_detector.get_all_navigation_elements()
+                # Re-detect only the tab-local navigation elements
+                nav_elements = await session.nav_detector.get_tab_local_elements()
 
                 # Expand sections
                 if nav_elements['expandables']:
-                    await self.page_navigator.expand_all_sections(
+                    await session.page_navigator.expand_all_sections(
                         nav_elements['expandables']
                     )
 
                 # Scrape tab
-                await self.scrape_current_view(tab_name)
+                await self.scrape_current_view(tab_name, session)
 
                 # Handle pagination within tab
                 if nav_elements['pagination']['has_pagination']:
-                    total_pages = await self.page_navigator.navigate_pagination(
+                    total_pages = await session.page_navigator.navigate_pagination(
                         nav_elements['pagination']
                     )
 
                     if total_pages > 1:
                         self.logger.info(f"  └─ Pagination detected: {total_pages} pages")
                         for page_num in range(2, total_pages + 1):
-                            await self.scrape_current_view(f"{tab_name} - Page {page_num}")
+                            await self.scrape_current_view(f"{tab_name} - Page {page_num}", session)
 
-            except Exception as e:
-                error_msg = f"Error scraping tab {tab_name}: {e}"
-                self.logger.error(error_msg)
-                self.stats['errors'].append(error_msg)
+        except Exception as e:
+            error_msg = f"Error scraping tab {tab_name}: {e}"
+            self.logger.error(error_msg)
+            self.stats['errors'].append(error_msg)
 
     async def generate_summary(self):
         """Generate summary report"""
         summary = {
-            'scrape_timestamp': datetime.now().isoformat(),
+            'scrape_timestamp': iso_now(),
             'target_url': self.url,
             'total_views_scraped': self.stats['views_scraped'],
             'total_tables': self.stats['tables_extracted'],
@@ -319,8 +463,7 @@ class DashboardScraper:
         }
 
         summary_path = self.output_dir / 'summary.json'
-        with open(summary_path, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        summary_path.write_bytes(json_dumps(summary))
 
         self.logger.info(f"\nSummary report saved to: {summary_path}")
 
@@ -336,6 +479,16 @@ class DashboardScraper:
 
     async def cleanup(self):
         """Cleanup resources"""
+        # Flush pending writes before shutting down
+        await self._flush_writes()
+
+        if self._io_pool:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
+
+        if self.page_pool:
+            await self.page_pool.close()
+
         if self.browser:
             await self.browser.close()
             self.logger.info("Browser closed")
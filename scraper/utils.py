@@ -3,14 +3,36 @@ Utility functions and decorators
 """
 
 import asyncio
+import atexit
+import json
 import logging
+import queue
+import random
 import re
+import time
+from datetime import datetime
 from functools import wraps
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 from typing import Any
 
 from . import config
 
+# orjson parses and serializes several times faster; the standard library is the fallback
+try:
+    import orjson
+    JSON_DUMP_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    orjson = None
+
+# Last formatted second for iso_now
+_last_iso_second = None
+_last_iso = ''
+
+# Filename sanitizing patterns
+_INVALID_FILENAME_CHARS = re.compile(r'[^\w\s-]')
+_FILENAME_SEPARATORS = re.compile(r'[-\s]+')
+
 
 def retry(max_attempts: int = config.MAX_RETRY_ATTEMPTS,
           delay: float = config.RETRY_DELAY):
@@ -19,7 +41,8 @@ def retry(max_attempts: int = config.MAX_RETRY_ATTEMPTS,
 
     Args:
         max_attempts: Maximum number of retry attempts
-        delay: Delay in seconds between retries
+        delay: Base delay in seconds; doubles after each attempt, plus jitter,
+            capped at config.MAX_RETRY_DELAY
     """
     def decorator(func):
         @wraps(func)
@@ -41,12 +64,62 @@ def retry(max_attempts: int = config.MAX_RETRY_ATTEMPTS,
                             f"Attempt {attempt + 1}/{max_attempts} failed: {e}. Retrying..."
                         )
 
-                    await asyncio.sleep(delay)
+                    backoff = delay * (2 ** attempt) + random.uniform(0, delay / 2)
+                    await asyncio.sleep(min(backoff, config.MAX_RETRY_DELAY))
             return None
         return wrapper
     return decorator
 
 
+def json_loads(data: Any) -> Any:
+    """
+    Parse a JSON document, using orjson when it is installed
+
+    Args:
+        data: JSON document as bytes or str
+
+    Returns:
+        Parsed Python object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any) -> bytes:
+    """
+    Serialize data to indented UTF-8 JSON, using orjson when it is installed
+
+    Args:
+        data: JSON-serializable object
+
+    Returns:
+        Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=JSON_DUMP_OPTIONS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def iso_now() -> str:
+    """
+    Get the current local time as an ISO 8601 string
+
+    The string has second resolution and is only re-formatted when the
+    second changes.
+
+    Returns:
+        Timestamp such as '2024-01-31T12:00:00'
+    """
+    global _last_iso_second, _last_iso
+
+    second = int(time.time())
+    if second != _last_iso_second:
+        _last_iso = datetime.fromtimestamp(second).isoformat()
+        _last_iso_second = second
+    return _last_iso
+
+
 def sanitize_filename(name: str, max_length: int = config.MAX_FILENAME_LENGTH) -> str:
     """
     Sanitize string for use in filename
@@ -59,9 +132,9 @@ def sanitize_filename(name: str, max_length: int = config.MAX_FILENAME_LENGTH) -
         Sanitized filename string
     """
     # Remove/replace invalid characters
-    name = re.sub(r'[^\w\s-]', '', name)
+    name = _INVALID_FILENAME_CHARS.sub('', name)
     # Replace spaces and hyphens with underscores
-    name = re.sub(r'[-\s]+', '_', name)
+    name = _FILENAME_SEPARATORS.sub('_', name)
     # Limit length
     return name[:max_length]
 
@@ -81,6 +154,9 @@ def setup_logging(log_dir: Path, log_level: str = 'INFO') -> logging.Logger:
     """
     Setup logging configuration
 
+    Records are put on a queue and written to the console and log file by a
+    background QueueListener, so logging never blocks the event loop on disk I/O.
+
     Args:
         log_dir: Directory for log files
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR)
@@ -91,8 +167,12 @@ def setup_logging(log_dir: Path, log_level: str = 'INFO') -> logging.Logger:
     logger = logging.getLogger('DashboardScraper')
     logger.setLevel(getattr(logging, log_level.upper()))
 
-    # Remove existing handlers
+    # Remove existing handlers and stop a previous listener
     logger.handlers.clear()
+    previous_listener = getattr(logger, 'queue_listener', None)
+    if previous_listener is not None:
+        atexit.unregister(previous_listener.stop)
+        previous_listener.stop()
 
     # Console handler
     console_handler = logging.StreamHandler()
@@ -109,8 +189,13 @@ def setup_logging(log_dir: Path, log_level: str = 'INFO') -> logging.Logger:
     )
     file_handler.setFormatter(file_formatter)
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logger.addHandler(QueueHandler(log_queue))
+    logger.queue_listener = listener
 
     return logger
 
@@ -125,4 +210,8 @@ def count_data_points(tables: list) -> int:
     Returns:
         Total number of data points (rows across all tables)
     """
-    return sum(len(table.get('rows', [])) for table in tables)
+    # Extractors record row_count on each table; count rows only if it is missing
+    return sum(
+        table['row_count'] if 'row_count' in table else len(table.get('rows', []))
+        for table in tables
+    )